@@ -2,70 +2,63 @@
 # double_pi_parser.py - Parse SPICE file and compute Double-π equivalent
 # Similar structure to PI_MODEL.py but for Double-π networks
 
-class Node:
-    def __init__(self, component_type, value, node1=None, node2=None):
-        self.component_type = component_type
-        self.value = value
-        self.node1 = node1
-        self.node2 = node2
-        self.next = None
-
-
-class LinkedList:
-    def __init__(self):
-        self.head = None
-
-    def append(self, component_type, value, node1=None, node2=None):
-        if not self.head:
-            self.head = Node(component_type, value, node1, node2)
-        else:
-            current = self.head
-            while current.next:
-                current = current.next
-            current.next = Node(component_type, value, node1, node2)
+import functools
+import io
+import logging
+import math
+from collections import defaultdict
+from operator import itemgetter
+
+log = logging.getLogger(__name__)
 
 
 def parse_hspice_file(filename):
     """
     Parse SPICE file and extract resistors and capacitors.
-    Returns two lists: Rs (resistors) and Cs (capacitors) in order.
+    Returns (components_ordered, Rs, Cs, components): the (type, value) pairs
+    in file order, the resistor and capacitor values, and the full records.
     """
-    linked_list = LinkedList()
-    components = []
+    components_ordered = []  # (type, value) in file order
+    R_items = []  # (index, name, value, node1, node2)
+    C_items = []
 
     with open(filename, "r") as f:
-        lines = f.readlines()
-        for line in lines:
-            line = line.strip()
-            if line.startswith("R") or line.startswith("C"):
-                parts = line.split()
-                if len(parts) >= 4:
-                    component_name = parts[0]
-                    component_type = parts[0][0]  # 'R' or 'C'
-                    node1 = parts[1]
-                    node2 = parts[2]
-                    try:
-                        value = float(parts[3])
-                        components.append((component_name, component_type, value, node1, node2))
-                        linked_list.append(component_type, value, node1, node2)
-                    except ValueError:
-                        pass  # Skip if value cannot be converted to float
-
-    # Sort components by name to maintain order (R1, R2, C1, C2, etc.)
-    components.sort(key=lambda x: x[0])
-
-    # Separate into resistors and capacitors lists
-    Rs = []
-    Cs = []
-
-    for comp in components:
-        comp_name, comp_type, value, n1, n2 = comp
-        if comp_type == 'R':
-            Rs.append(value)
-        elif comp_type == 'C':
-            Cs.append(value)
-
-    return linked_list, Rs, Cs, components
+        for line in f:
+            # Dispatch on the first character; only indented lines need stripping
+            first = line[:1]
+            if first.isspace():
+                first = line.lstrip()[:1]
+            if first != "R" and first != "C":
+                continue
+            parts = line.split()
+            if len(parts) >= 4:
+                component_name = parts[0]
+                component_type = first  # 'R' or 'C'
+                node1 = parts[1]
+                node2 = parts[2]
+                try:
+                    value = float(parts[3])
+                except ValueError:
+                    continue  # Skip if value cannot be converted to float
+                try:
+                    index = int(component_name[1:])
+                except ValueError:
+                    index = math.inf  # Names without a numeric suffix go last
+                items = R_items if component_type == 'R' else C_items
+                items.append((index, component_name, value, node1, node2))
+                components_ordered.append((component_type, value))
+
+    # Natural order by numeric suffix (R2 before R10), then by name
+    by_index = itemgetter(0, 1)
+    R_items.sort(key=by_index)
+    C_items.sort(key=by_index)
+
+    Rs = [value for _, _, value, _, _ in R_items]
+    Cs = [value for _, _, value, _, _ in C_items]
+    components = ([(name, 'C', value, n1, n2) for _, name, value, n1, n2 in C_items] +
+                  [(name, 'R', value, n1, n2) for _, name, value, n1, n2 in R_items])
+
+    return components_ordered, Rs, Cs, components
 
 
 def detect_exact_double_pi_from_spice(components, tol=1e-12):
@@ -73,96 +66,88 @@ def detect_exact_double_pi_from_spice(components, tol=1e-12):
     Analyze SPICE components to detect double-π structure.
     Groups capacitors based on actual circuit topology with zero-ohm shorts.
     """
-    # Build node-to-components mapping
-    node_caps = {}  # node -> list of capacitor values
-    all_resistors = []  # (from_node, to_node, value)
+    # One pass over the components: per-node ground capacitance, the
+    # non-zero / zero-ohm resistor split, and the set of non-ground nodes
+    node_cap_sum = defaultdict(float)  # node -> total capacitance to ground
+    nonzero_resistors = []  # (from_node, to_node, value)
+    zero_resistors = []
+    all_nodes = set()
 
     for comp_name, comp_type, value, node1, node2 in components:
         if comp_type == 'C':
             # Capacitor from node to ground
             if node2 == '0':  # to ground
-                if node1 not in node_caps:
-                    node_caps[node1] = []
-                node_caps[node1].append(value)
+                node_cap_sum[node1] += value
             elif node1 == '0':  # from ground (reverse)
-                if node2 not in node_caps:
-                    node_caps[node2] = []
-                node_caps[node2].append(value)
+                node_cap_sum[node2] += value
         elif comp_type == 'R':
-            all_resistors.append((node1, node2, value))
-
-    # Find non-zero resistors
-    nonzero_resistors = [(n1, n2, val) for n1, n2, val in all_resistors if abs(val) >= tol]
-    zero_resistors = [(n1, n2, val) for n1, n2, val in all_resistors if abs(val) < tol]
+            (nonzero_resistors if abs(value) >= tol else zero_resistors).append((node1, node2, value))
+            if node1 != '0':
+                all_nodes.add(node1)
+            if node2 != '0':
+                all_nodes.add(node2)
 
     if len(nonzero_resistors) != 2:
         return None
 
-    print(f"Debug: Non-zero resistors: {nonzero_resistors}")
-    print(f"Debug: Zero resistors: {zero_resistors}")
-    print(f"Debug: Node capacitors: {node_caps}")
-
-    # Build zero-ohm connectivity groups
-    def find_connected_nodes(start_node):
-        """Find all nodes connected to start_node through zero-ohm resistors."""
-        connected = {start_node}
-        changed = True
-        while changed:
-            changed = False
-            for n1, n2, val in zero_resistors:
-                if n1 in connected and n2 not in connected:
-                    connected.add(n2)
-                    changed = True
-                elif n2 in connected and n1 not in connected:
-                    connected.add(n1)
-                    changed = True
-        return connected
-
-    # Find all unique zero-ohm groups
-    all_nodes = set()
-    for n1, n2, val in all_resistors:
-        if n1 != '0':
-            all_nodes.add(n1)
-        if n2 != '0':
-            all_nodes.add(n2)
-
-    visited = set()
-    groups = []
+    # Lazy %s formatting: nothing is rendered unless debug logging is on
+    log.debug("Non-zero resistors: %s", nonzero_resistors)
+    log.debug("Zero resistors: %s", zero_resistors)
+    log.debug("Node capacitors: %s", node_cap_sum)
+
+    # Union-find over the zero-ohm shorts: one pass over zero_resistors
+    # instead of a fixed-point rescan per starting node. Ground stays in
+    # the structure so nodes shorted to it still merge, then drops out below.
+    parent = {node: node for node in all_nodes}
+    parent['0'] = '0'
+    rank = dict.fromkeys(parent, 0)
+
+    def find(node):
+        """Root of node's zero-ohm group, halving the path on the way up."""
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for n1, n2, val in zero_resistors:
+        root1, root2 = find(n1), find(n2)
+        if root1 == root2:
+            continue
+        if rank[root1] < rank[root2]:
+            root1, root2 = root2, root1
+        parent[root2] = root1
+        if rank[root1] == rank[root2]:
+            rank[root1] += 1
+
+    # Groups come out in first-seen order over all_nodes, as before
+    groups_by_root = {}
     for node in all_nodes:
-        if node not in visited:
-            group = find_connected_nodes(node)
-            group.discard('0')  # Remove ground
-            if group:
-                groups.append(group)
-                visited.update(group)
+        groups_by_root.setdefault(find(node), set()).add(node)
+    groups = list(groups_by_root.values())
 
-    print(f"Debug: Zero-ohm connected groups: {[list(g) for g in groups]}")
+    log.debug("Zero-ohm connected groups: %s", groups)
 
     # Calculate capacitor sum for each group
     group_caps = []
     for group in groups:
-        cap_sum = sum(sum(node_caps.get(node, [])) for node in group)
+        cap_sum = sum(node_cap_sum[node] for node in group)
         group_caps.append((group, cap_sum))
 
-    print(f"Debug: Groups with capacitor sums: {[(list(g), c) for g, c in group_caps]}")
+    log.debug("Groups with capacitor sums: %s", group_caps)
 
-    # Build adjacency based on non-zero resistors
-    group_adjacency = {}
+    # Build adjacency based on non-zero resistors: map each node to its
+    # group index once, then visit every resistor a single time
+    node_group = {node: i for i, (group, cap) in enumerate(group_caps) for node in group}
+    group_adjacency = {i: [] for i in range(len(group_caps))}
 
-    for i, (group1, cap1) in enumerate(group_caps):
-        group_adjacency[i] = []
-        for r_from, r_to, r_val in nonzero_resistors:
-            for j, (group2, cap2) in enumerate(group_caps):
-                if i != j:
-                    # Check if this resistor connects group i to group j
-                    connects = False
-                    if (r_from in group1 and r_to in group2) or (r_to in group1 and r_from in group2):
-                        connects = True
+    for r_from, r_to, r_val in nonzero_resistors:
+        gi = node_group.get(r_from)
+        gj = node_group.get(r_to)
+        if gi is not None and gj is not None and gi != gj:
+            group_adjacency[gi].append((gj, r_val))
+            group_adjacency[gj].append((gi, r_val))
 
-                    if connects:
-                        group_adjacency[i].append((j, r_val))
-
-    print(f"Debug: Group adjacency: {group_adjacency}")
+    log.debug("Group adjacency: %s", group_adjacency)
 
     # Find the linear path: start -> middle -> end
     # The middle group connects to 2 other groups, start and end connect to 1 each
@@ -183,21 +168,19 @@ def detect_exact_double_pi_from_spice(components, tol=1e-12):
         C2 = group_caps[middle_group][1]
         C3 = group_caps[end_group][1]
 
-        # Get resistor values by checking which resistors connect the groups
+        # Get resistor values by checking which groups each resistor joins,
+        # reusing the node -> group map from the adjacency build
         R1 = R2 = None
+        start_middle = {start_group, middle_group}
+        middle_end = {middle_group, end_group}
         for r_from, r_to, r_val in nonzero_resistors:
-            start_nodes = group_caps[start_group][0]
-            middle_nodes = group_caps[middle_group][0]
-            end_nodes = group_caps[end_group][0]
-
-            if ((r_from in start_nodes and r_to in middle_nodes) or
-                    (r_to in start_nodes and r_from in middle_nodes)):
+            joined = {node_group.get(r_from), node_group.get(r_to)}
+            if joined == start_middle:
                 R1 = r_val
-            elif ((r_from in middle_nodes and r_to in end_nodes) or
-                  (r_to in middle_nodes and r_from in end_nodes)):
+            elif joined == middle_end:
                 R2 = r_val
 
-        print(f"Debug: Final assignment - R1={R1}, R2={R2}, C1={C1}, C2={C2}, C3={C3}")
+        log.debug("Final assignment - R1=%s, R2=%s, C1=%s, C2=%s, C3=%s", R1, R2, C1, C2, C3)
 
         if R1 is not None and R2 is not None and R1 > 0 and R2 > 0 and C1 >= 0 and C2 >= 0 and C3 >= 0:
             return R1, R2, C1, C2, C3
@@ -205,20 +188,13 @@ def detect_exact_double_pi_from_spice(components, tol=1e-12):
     return None
 
 
-def apply_rules_reverse_linked_list(linked_list):
+def apply_rules_reverse_linked_list(components_ordered):
     """
-    Apply upstream traversal rules using reverse linked list traversal.
+    Apply upstream traversal rules by walking the (type, value) list in reverse.
     Start from the last component (which should be a capacitor) and work backwards.
     Returns y1, y2, y3, y4, y5 moments.
     """
-    # First, collect all components into a list for reverse traversal
-    components = []
-    current = linked_list.head
-    while current:
-        components.append((current.component_type, current.value))
-        current = current.next
-
-    if not components:
+    if not components_ordered:
         return 0.0, 0.0, 0.0, 0.0, 0.0
 
     # Initialize moments at downstream end
@@ -226,25 +202,32 @@ def apply_rules_reverse_linked_list(linked_list):
 
     # Start from the last component (should be capacitor)
     # Traverse in reverse order (upstream direction)
-    for i in range(len(components) - 1, -1, -1):
-        component_type, value = components[i]
-
+    for component_type, value in reversed(components_ordered):
         if component_type == "C":  # Capacitor rule
             y1 += value
             # y2, y3, y4, y5 remain unchanged for capacitor
 
         elif component_type == "R":  # Resistor rule
             R = value
+            # Powers shared by several terms, computed once per resistor
+            R2 = R * R
+            R3 = R2 * R
+            R4 = R3 * R
+            y1_2 = y1 * y1
+            y1_3 = y1_2 * y1
+            y1_4 = y1_3 * y1
+            y1_5 = y1_4 * y1
+            y2_2 = y2 * y2
             # Apply upstream resistor transformation rules
             y1_new = y1  # y1 unchanged for resistor
-            y2_new = y2 - R * (y1 ** 2)
-            y3_new = y3 - 2.0 * R * y1 * y2 + (R ** 2) * (y1 ** 3)
-            y4_new = y4 - R * (2.0 * y1 * y3 + y2 ** 2) + 3.0 * (R ** 2) * (y1 ** 2) * y2 - (R ** 3) * (y1 ** 4)
+            y2_new = y2 - R * y1_2
+            y3_new = y3 - 2.0 * R * y1 * y2 + R2 * y1_3
+            y4_new = y4 - R * (2.0 * y1 * y3 + y2_2) + 3.0 * R2 * y1_2 * y2 - R3 * y1_4
             y5_new = (y5
                       - R * (2.0 * y1 * y4 + 2.0 * y2 * y3)
-                      + (R ** 2) * (3.0 * (y1 ** 2) * y3 + 3.0 * y1 * (y2 ** 2))
-                      - 4.0 * (R ** 3) * (y1 ** 3) * y2
-                      + (R ** 4) * (y1 ** 5))
+                      + R2 * (3.0 * y1_2 * y3 + 3.0 * y1 * y2_2)
+                      - 4.0 * R3 * y1_3 * y2
+                      + R4 * y1_5)
 
             y1, y2, y3, y4, y5 = y1_new, y2_new, y3_new, y4_new, y5_new
 
@@ -255,8 +238,8 @@ def ladder_moments_up_to_5(Rs, Cs):
     """
     Compute the first five series coefficients of Y(s) at the driver:
       Y(s) = y1 s + y2 s^2 + y3 s^3 + y4 s^4 + y5 s^5 + ...
-    Uses upstream traversal rules from the Double-Pi code.
-    This is a fallback when linked list is not used.
+    Uses the same upstream traversal as apply_rules_reverse_linked_list.
+    This is a fallback when only the Rs/Cs arrays are available.
     """
     if len(Cs) != len(Rs) + 1:
         # Handle flexible arrays - pad with zeros if needed
@@ -265,31 +248,13 @@ def ladder_moments_up_to_5(Rs, Cs):
         elif len(Rs) < len(Cs) - 1:
             Rs = Rs + [0.0] * (len(Cs) - 1 - len(Rs))
 
-    # Start at far end (node N)
-    y1 = Cs[-1]
-    y2 = y3 = y4 = y5 = 0.0
-
-    # Walk upstream: for k = N-1..0
-    for k in range(len(Rs) - 1, -1, -1):
-        R = Rs[k]
-
-        # Cross series resistor
-        y1p = y1
-        y2p = y2 - R * (y1 ** 2)
-        y3p = y3 - 2.0 * R * y1 * y2 + (R ** 2) * (y1 ** 3)
-        y4p = y4 - R * (2.0 * y1 * y3 + y2 ** 2) + 3.0 * (R ** 2) * (y1 ** 2) * y2 - (R ** 3) * (y1 ** 4)
-        y5p = (y5
-               - R * (2.0 * y1 * y4 + 2.0 * y2 * y3)
-               + (R ** 2) * (3.0 * (y1 ** 2) * y3 + 3.0 * y1 * (y2 ** 2))
-               - 4.0 * (R ** 3) * (y1 ** 3) * y2
-               + (R ** 4) * (y1 ** 5))
-        y1, y2, y3, y4, y5 = y1p, y2p, y3p, y4p, y5p
-
-        # Then add the capacitor at this node k
-        if k < len(Cs):
-            y1 += Cs[k]
-
-    return y1, y2, y3, y4, y5
+    # Interleave into file order (C0 R0 C1 ... R(N-1) CN) and reuse the
+    # single upstream recurrence instead of keeping a second copy of it
+    components_ordered = [("C", Cs[0])]
+    for R, C in zip(Rs, Cs[1:]):
+        components_ordered.append(("R", R))
+        components_ordered.append(("C", C))
+    return apply_rules_reverse_linked_list(components_ordered)
 
 
 def detect_exact_double_pi(Rs, Cs, tol=1e-12):
@@ -298,6 +263,10 @@ def detect_exact_double_pi(Rs, Cs, tol=1e-12):
     Returns (R1, R2, C1, C2, C3) if exact, None otherwise.
     (Fallback array-based method)
     """
+    # Ensure we have enough capacitors (cheapest check first)
+    if len(Cs) < 3:
+        return None
+
     # Find non-zero resistors
     nz_indices = [i for i, R in enumerate(Rs) if abs(R) >= tol]
     if len(nz_indices) != 2:
@@ -305,17 +274,12 @@ def detect_exact_double_pi(Rs, Cs, tol=1e-12):
 
     i1, i2 = nz_indices
 
-    # Ensure we have enough capacitors
-    if len(Cs) < 3:
-        return None
-
     # Group capacitors based on resistor boundaries
     if len(Cs) == len(Rs) + 1:
         # Standard ladder format
-        N = len(Cs) - 1
-        C1 = sum(Cs[j] for j in range(0, i1 + 1))
-        C2 = sum(Cs[j] for j in range(i1 + 1, i2 + 1))
-        C3 = sum(Cs[j] for j in range(i2 + 1, N + 1))
+        C1 = sum(Cs[0:i1 + 1])
+        C2 = sum(Cs[i1 + 1:i2 + 1])
+        C3 = sum(Cs[i2 + 1:])
     else:
         # Flexible format - divide into 3 sections
         n_caps = len(Cs)
@@ -341,13 +305,123 @@ def detect_exact_double_pi(Rs, Cs, tol=1e-12):
     return R1, R2, C1, C2, C3
 
 
+def golden_section_search(f, lo, hi, xatol=1e-12, ftol=0.0):
+    """
+    Minimise a unimodal scalar function on [lo, hi] by golden-section search,
+    one new evaluation per step, until the bracket is narrower than xatol
+    or a point with f(x) <= ftol has been found.
+    Ties keep the lower part of the bracket (the passive region in alpha
+    always starts at 0). Returns (f(x), x) for the best interior point.
+    """
+    invphi = (math.sqrt(5.0) - 1.0) / 2.0
+    a, b = lo, hi
+    c = b - invphi * (b - a)
+    d = a + invphi * (b - a)
+    fc, fd = f(c), f(d)
+    while b - a > xatol and min(fc, fd) > ftol:
+        if fc <= fd:
+            b, d, fd = d, c, fc
+            c = b - invphi * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + invphi * (b - a)
+            fd = f(d)
+    return (fc, c) if fc <= fd else (fd, d)
+
+
+def false_position_root(f, a, b, fa, fb, xatol=1e-12, ftol=0.0, maxiter=100):
+    """
+    Find a root of f inside [a, b], where fa and fb have opposite signs,
+    by the Illinois variant of regula falsi (superlinear, never leaves the
+    bracket). Stops once |f(x)| <= ftol or the bracket is narrower than xatol.
+    Returns (|f(x)|, x), or None if f is undefined (NaN) somewhere on the way.
+    """
+    x, fx = a, fa
+    side = 0
+    for _ in range(maxiter):
+        if abs(b - a) <= xatol:
+            break
+        x = (a * fb - b * fa) / (fb - fa)
+        fx = f(x)
+        if fx != fx:
+            return None
+        if abs(fx) <= ftol:
+            break
+        if (fx > 0.0) == (fb > 0.0):
+            b, fb = x, fx
+            if side == -1:
+                fa *= 0.5  # Illinois step: stop a stale endpoint stalling
+            side = -1
+        else:
+            a, fa = x, fx
+            if side == 1:
+                fb *= 0.5
+            side = 1
+    return abs(fx), x
+
+
+@functools.lru_cache(maxsize=32)
+def best_alpha_beta(k1, k2_target, tol=1e-10):
+    """
+    Search alpha in (0, 0.5) for the symmetric double-π whose normalised
+    second moment matches k2_target, with beta tied to k1 by the first moment.
+    Depends only on the two dimensionless targets, so results are cached.
+    Stops as soon as the residual is within tol.
+    Returns (err, alpha, beta), or None if no passive (alpha, beta) exists.
+    """
+    def signed_residual(alpha):
+        """k2(alpha, beta(alpha)) - k2_target, or NaN outside the passive region."""
+        d = 1.0 - 2.0 * alpha
+        if d < 1e-15:
+            return math.nan
+        beta = (k1 - alpha * alpha) / d
+        if not (0.0 < beta < 1.0):  # also rejects NaN and +/-inf
+            return math.nan
+        S = 1.0 - alpha
+        nb = 1.0 - beta
+        a2 = alpha * alpha
+        return beta * beta * S * S * S + 2.0 * beta * nb * S * a2 + nb * nb * a2 * alpha - k2_target
+
+    def residual(alpha):
+        """|signed_residual(alpha)|, or inf outside the passive region."""
+        r = signed_residual(alpha)
+        return abs(r) if r == r else math.inf
+
+    # Coarse 9-point sweep picks the starting bracket, so the refinement
+    # is not trapped at the alpha -> 0.5 boundary where d -> 0.
+    eps = 1e-6
+    coarse = [eps + (0.5 - 2 * eps) * (i / 8.0) for i in range(9)]
+    signed = [signed_residual(a) for a in coarse]
+    errs = [abs(r) if r == r else math.inf for r in signed]
+    j = min(range(9), key=errs.__getitem__)
+    if errs[j] == math.inf:
+        return None
+    if errs[j] <= tol:
+        alpha = coarse[j]
+        return errs[j], alpha, (k1 - alpha * alpha) / (1.0 - 2.0 * alpha)
+
+    # A sign change next to the best point brackets an exact match:
+    # solve for the root rather than minimising |residual|
+    best = None
+    for k in (j - 1, j + 1):
+        if 0 <= k <= 8 and signed[k] * signed[j] < 0.0:
+            lo, hi = min(j, k), max(j, k)
+            best = false_position_root(signed_residual, coarse[lo], coarse[hi],
+                                       signed[lo], signed[hi], ftol=tol)
+            if best is not None:
+                break
+    if best is None:
+        best = golden_section_search(residual, coarse[max(j - 1, 0)], coarse[min(j + 1, 8)], ftol=tol)
+    err, alpha = best
+    return err, alpha, (k1 - alpha * alpha) / (1.0 - 2.0 * alpha)
+
+
 def solve_double_pi_symmetric(Rtot, Ctot, m1, m2, tol=1e-10):
     """
     Solve for symmetric double-π using moment matching.
     Returns R1, R2, C1, C2, C3.
     """
-    import math
-
     R, C = Rtot, Ctot
     if R <= 0 or C <= 0:
         raise ValueError("Totals must be positive.")
@@ -355,32 +429,8 @@ def solve_double_pi_symmetric(Rtot, Ctot, m1, m2, tol=1e-10):
     k1 = -m1 / (R * C * C)
     k2_target = m2 / (R * R * C * C * C)
 
-    def _k2_from(alpha, beta):
-        S = (1.0 - alpha)
-        a = alpha
-        b = beta
-        return (b ** 2) * (S ** 3) + 2 * b * (1 - b) * (S * (a ** 2)) + ((1 - b) ** 2) * (a ** 3)
-
-    def beta_from_alpha(alpha):
-        d = 1.0 - 2.0 * alpha
-        if abs(d) < 1e-15:
-            return None
-        return (k1 - alpha * alpha) / d
-
-    eps = 1e-6
-    best = None  # (err, alpha, beta)
-    for i in range(1200):
-        alpha = eps + (0.5 - 2 * eps) * (i / 1199.0)
-        beta = beta_from_alpha(alpha)
-        if beta is None or not math.isfinite(beta):
-            continue
-        if not (0.0 < beta < 1.0):
-            continue
-        if (1.0 - 2.0 * alpha) < 0.0:
-            continue
-        err = abs(_k2_from(alpha, beta) - k2_target)
-        if best is None or err < best[0]:
-            best = (err, alpha, beta)
+    # Round to 12 significant digits so float noise still hits the cache
+    best = best_alpha_beta(float(f"{k1:.12g}"), float(f"{k2_target:.12g}"), tol)  # (err, alpha, beta)
 
     if best is None:
         # Passive fallback
@@ -414,10 +464,6 @@ def generate_double_pi_spice_file(input_file, output_file, R1, R2, C1, C2, C3):
     """
     Generate new SPICE file with Double-π model replacing the original RC network.
     """
-    # Read the original file to preserve structure and content
-    with open(input_file, "r") as f:
-        original_lines = f.readlines()
-
     # Process the file by identifying different sections
     subckt_lines = []
     subckt_section = False
@@ -431,91 +477,87 @@ def generate_double_pi_spice_file(input_file, output_file, R1, R2, C1, C2, C3):
     # Find the node where the RC network begins
     start_node = "1"  # Default if we can't determine
 
-    for line in original_lines:
-        line_stripped = line.strip()
-
-        # Handle subcircuit section
-        if line_stripped.startswith(".subckt"):
-            subckt_section = True
-            subckt_lines.append(line)
-        elif subckt_section and not inverter_ends_found and line_stripped.startswith(".ends"):
-            subckt_lines.append(line)
-            subckt_section = False
-            inverter_ends_found = True
-        elif subckt_section:
-            subckt_lines.append(line)
-
-        # Handle other sections
-        elif line_stripped.startswith(".temp") or line_stripped.startswith(".lib"):
-            header_lines.append(line)
-        elif line_stripped.startswith("xi0") or line_stripped.startswith("vdd") or line_stripped.startswith("vin"):
-            circuit_lines.append(line)
-            # Try to find the output node of the inverter
-            if line_stripped.startswith("xi0"):
-                parts = line_stripped.split()
-                if len(parts) >= 5:
-                    start_node = parts[4]  # Output node of inverter
-        elif line_stripped.startswith("R") or line_stripped.startswith("C"):
-            rc_section_found = True
-        elif line_stripped.startswith(".tran") or line_stripped.startswith(".options") or line_stripped.startswith(
-                ".end"):
-            footer_lines.append(line)
-
-    # Create the new file with Double-π model
-    with open(output_file, "w") as f:
-        # Write header with comment
-        f.write("*****\n****Double-π RC Network****\n******\n")
-
-        # Write header lines
-        for line in header_lines:
-            f.write(line)
-
-        # Write subcircuit definition
-        for line in subckt_lines:
-            f.write(line)
-
-        # Write circuit components before RC network
-        for line in circuit_lines:
-            f.write(line)
-
-        # Write Double-π model components
-        f.write(f"R1 {start_node} 2 {R1:.6g}\n")
-        f.write(f"R2 2 3 {R2:.6g}\n")
-        f.write(f"C1 {start_node} 0 {C1:.6g}\n")
-        f.write(f"C2 2 0 {C2:.6g}\n")
-        f.write(f"C3 3 0 {C3:.6g}\n")
-
-        # Write footer
-        for line in footer_lines:
-            f.write(line)
+    # Stream the original file; each line is stripped once and classified
+    # with tuple startswith checks
+    with open(input_file, "r") as f:
+        for line in f:
+            line_stripped = line.strip()
+
+            # Handle subcircuit section
+            if line_stripped.startswith(".subckt"):
+                subckt_section = True
+                subckt_lines.append(line)
+            elif subckt_section and not inverter_ends_found and line_stripped.startswith(".ends"):
+                subckt_lines.append(line)
+                subckt_section = False
+                inverter_ends_found = True
+            elif subckt_section:
+                subckt_lines.append(line)
+
+            # Handle other sections
+            elif line_stripped.startswith((".temp", ".lib")):
+                header_lines.append(line)
+            elif line_stripped.startswith(("xi0", "vdd", "vin")):
+                circuit_lines.append(line)
+                # Try to find the output node of the inverter
+                if line_stripped.startswith("xi0"):
+                    parts = line_stripped.split()
+                    if len(parts) >= 5:
+                        start_node = parts[4]  # Output node of inverter
+            elif line_stripped.startswith(("R", "C")):
+                rc_section_found = True
+            elif line_stripped.startswith((".tran", ".options", ".end")):
+                footer_lines.append(line)
+
+    # Assemble the new file with Double-π model, then write it once
+    out = ["*****\n****Double-π RC Network****\n******\n"]
+    out += header_lines
+    out += subckt_lines
+    # Circuit components before RC network
+    out += circuit_lines
+
+    # Double-π model components
+    out.append(f"R1 {start_node} 2 {R1:.6g}\n")
+    out.append(f"R2 2 3 {R2:.6g}\n")
+    out.append(f"C1 {start_node} 0 {C1:.6g}\n")
+    out.append(f"C2 2 0 {C2:.6g}\n")
+    out.append(f"C3 3 0 {C3:.6g}\n")
+
+    out += footer_lines
+    # Ensure there's an .end statement if none was found
+    if not any(line.strip().startswith(".end") for line in footer_lines):
+        out.append(".end\n")
 
-        # Ensure there's an .end statement if none was found
-        if not any(line.strip().startswith(".end") for line in footer_lines):
-            f.write(".end\n")
+    with open(output_file, "w") as f:
+        f.write("".join(out))
 
 
 def save_double_pi_values(y1, y2, y3, y4, y5, R1, R2, C1, C2, C3, is_exact=False):
     """
     Save Double-π model values and moments to a text file.
     """
-    with open("double_pi_values.txt", "w") as f:
-        f.write("Double-π Model Values:\n")
-        f.write("=" * 30 + "\n")
-        f.write(f"Method: {'Exact' if is_exact else 'Moment-matched fit'}\n\n")
-
-        f.write("Y(s) Series Coefficients (Moments):\n")
-        f.write(f"y1 = {y1:.6g}\n")
-        f.write(f"y2 = {y2:.6g}\n")
-        f.write(f"y3 = {y3:.6g}\n")
-        f.write(f"y4 = {y4:.6g}\n")
-        f.write(f"y5 = {y5:.6g}\n\n")
+    # Assemble the report in memory and write the file once
+    buf = io.StringIO()
+    buf.write("Double-π Model Values:\n")
+    buf.write("=" * 30 + "\n")
+    buf.write(f"Method: {'Exact' if is_exact else 'Moment-matched fit'}\n\n")
+
+    buf.write("Y(s) Series Coefficients (Moments):\n")
+    buf.write(f"y1 = {y1:.6g}\n")
+    buf.write(f"y2 = {y2:.6g}\n")
+    buf.write(f"y3 = {y3:.6g}\n")
+    buf.write(f"y4 = {y4:.6g}\n")
+    buf.write(f"y5 = {y5:.6g}\n\n")
+
+    buf.write("Final Double-π Component Values:\n")
+    buf.write(f"R1 = {R1:.6g} Ω\n")
+    buf.write(f"R2 = {R2:.6g} Ω\n")
+    buf.write(f"C1 = {C1:.6g} F\n")
+    buf.write(f"C2 = {C2:.6g} F\n")
+    buf.write(f"C3 = {C3:.6g} F\n")
 
-        f.write("Final Double-π Component Values:\n")
-        f.write(f"R1 = {R1:.6g} Ω\n")
-        f.write(f"R2 = {R2:.6g} Ω\n")
-        f.write(f"C1 = {C1:.6g} F\n")
-        f.write(f"C2 = {C2:.6g} F\n")
-        f.write(f"C3 = {C3:.6g} F\n")
+    with open("double_pi_values.txt", "w") as f:
+        f.write(buf.getvalue())
 
 
 # Main execution flow
@@ -526,18 +568,18 @@ def main():
     try:
         # Parse the SPICE file
         print("Parsing SPICE file...")
-        linked_list, Rs, Cs, components = parse_hspice_file(input_file)
+        components_ordered, Rs, Cs, components = parse_hspice_file(input_file)
 
         print(f"Found {len(Rs)} resistors and {len(Cs)} capacitors")
         print(f"Resistors: {Rs}")
         print(f"Capacitors: {Cs}")
-        print(f"Components with nodes: {components}")
+        log.debug("Components with nodes: %s", components)
 
-        # Calculate Y(s) moments using proper reverse linked list traversal
-        print("\nCalculating Y(s) moments using reverse linked list traversal...")
-        y1, y2, y3, y4, y5 = apply_rules_reverse_linked_list(linked_list)
+        # Calculate Y(s) moments by walking the components upstream
+        print("\nCalculating Y(s) moments using reverse component traversal...")
+        y1, y2, y3, y4, y5 = apply_rules_reverse_linked_list(components_ordered)
 
-        print("Y(s) Series Coefficients (from linked list):")
+        print("Y(s) Series Coefficients (from component list):")
         print(f"y1 = {y1:.6g}")
         print(f"y2 = {y2:.6g}")
         print(f"y3 = {y3:.6g}")
@@ -563,8 +605,8 @@ def main():
             else:
                 # Use moment-matched symmetric approach
                 print("Using moment-matched symmetric Double-π...")
-                Rtot, Ctot = sum(Rs), sum(Cs)
-                m1, m2 = y2, y3  # Use y2, y3 as m1, m2 from linked list calculation
+                Rtot, Ctot = sum(Rs), y1  # y1 is already the total capacitance
+                m1, m2 = y2, y3  # Use y2, y3 as m1, m2 from the upstream traversal
                 R1, R2, C1, C2, C3, used_fallback = solve_double_pi_symmetric(Rtot, Ctot, m1, m2)
                 is_exact = False
                 if used_fallback:
@@ -583,7 +625,7 @@ def main():
         print(f"\nGenerating Double-π SPICE file: {output_file}")
         generate_double_pi_spice_file(input_file, output_file, R1, R2, C1, C2, C3)
 
-        # Save results to a file (use linked list moments)
+        # Save results to a file (use traversal moments)
         save_double_pi_values(y1, y2, y3, y4, y5, R1, R2, C1, C2, C3, is_exact)
         print("Results saved to double_pi_values.txt")
 
@@ -6,40 +6,48 @@ from tkinter import messagebox
 from tkinter import filedialog
 
 from datetime import datetime
+from math import fsum
 
 def parse_float_list(csv_text: str):
     csv_text = csv_text.strip()
     if not csv_text:
         return []
     try:
-        return [float(x.strip()) for x in csv_text.split(",") if x.strip()]
+        return list(map(float, filter(str.strip, csv_text.split(","))))
     except ValueError as e:
         raise ValueError("Enter numbers as plain floats (e.g., 1e-15,2e-15).")
 
 def write_reduced_spef(path: str, net: str, root_node: str, C_eq: float):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # build the whole file, then write it in one call
+    text = "".join((
+        '*SPEF "IEEE 1481-1999"\n',
+        f"*DESIGN lumped_c_gui\n*DATE {now}\n*VENDOR script\n",
+        "*DIVIDER /\n*DELIMITER :\n*BUS_DELIMITER [ ]\n",
+        "*T_UNIT 1\n*C_UNIT 1\n*R_UNIT 1\n",
+        f"*D_NET {net} {C_eq:g}\n",
+        "*CONN\n",
+        "*CAP\n",
+        f"1 {root_node} {C_eq:g}\n",
+        "*RES\n",
+        "*END\n",
+    ))
     with open(path, "w") as f:
-        f.write('*SPEF "IEEE 1481-1999"\n')
-        f.write(f"*DESIGN lumped_c_gui\n*DATE {now}\n*VENDOR script\n")
-        f.write("*DIVIDER /\n*DELIMITER :\n*BUS_DELIMITER [ ]\n")
-        f.write("*T_UNIT 1\n*C_UNIT 1\n*R_UNIT 1\n")
-        f.write(f"*D_NET {net} {C_eq:g}\n")
-        f.write("*CONN\n")
-        f.write("*CAP\n")
-        f.write(f"1 {root_node} {C_eq:g}\n")
-        f.write("*RES\n")
-        f.write("*END\n")
+        f.write(text)
 
 def write_spice_tb(path: str, C_eq: float, Rdrv: float, VDD: float):
+    text = "".join((
+        "* Lumped-C testbench (manual)\n",
+        f".param VDD={VDD}\n",
+        "VSTEP in 0 PULSE(0 VDD 0 1p 1p 50p 100p)\n",
+        f"RDRV in n1 {Rdrv:g}\n",
+        f"CLOAD n1 0 {C_eq:g}\n",
+        ".tran 1p 2n\n",
+        ".probe v(in) v(n1)\n",
+        ".end\n",
+    ))
     with open(path, "w") as f:
-        f.write(f"* Lumped-C testbench (manual)\n")
-        f.write(f".param VDD={VDD}\n")
-        f.write(f"VSTEP in 0 PULSE(0 VDD 0 1p 1p 50p 100p)\n")
-        f.write(f"RDRV in n1 {Rdrv:g}\n")
-        f.write(f"CLOAD n1 0 {C_eq:g}\n")
-        f.write(f".tran 1p 2n\n")
-        f.write(f".probe v(in) v(n1)\n")
-        f.write(f".end\n")
+        f.write(text)
 
 class App(tk.Tk):
     def __init__(self):
@@ -95,16 +103,23 @@ class App(tk.Tk):
         row += 1
 
         self.current_ceq = None  # cache after compute
+        self._last_inputs = None  # (cs_text, rs_text) behind current_ceq
 
     def compute(self):
+        cs_text = self.cs_entry.get()
+        rs_text = self.rs_entry.get()
+        # Compute -> Save SPEF -> Save SPICE with unchanged inputs: reuse C_eq
+        if self.current_ceq is not None and (cs_text, rs_text) == self._last_inputs:
+            return
         try:
-            Cs = parse_float_list(self.cs_entry.get())
-            _ = parse_float_list(self.rs_entry.get()) if self.rs_entry.get().strip() else []
+            Cs = parse_float_list(cs_text)
+            _ = parse_float_list(rs_text) if rs_text.strip() else []
             if not Cs:
                 messagebox.showerror("Input error", "Enter at least one ground capacitor in Cs.")
                 return
-            C_eq = sum(Cs)  # ground only; coupling is intentionally ignored
+            C_eq = fsum(Cs)  # ground only; coupling is intentionally ignored
             self.current_ceq = C_eq
+            self._last_inputs = (cs_text, rs_text)
             self.ceq_var.set(f"C_eq = {C_eq:g} F")
         except Exception as e:
             messagebox.showerror("Input error", str(e))
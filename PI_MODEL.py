@@ -1,105 +1,90 @@
-class Node:
-    def __init__(self, component_type, value):
-        self.component_type = component_type
-        self.value = value
-        self.next = None
+import re
+from array import array
+from collections import Counter
 
+# First non-blank character of an R or C element line, either case
+_RC_LINE = re.compile(r'\s*([RrCc])')
 
-class LinkedList:
-    def __init__(self):
-        self.head = None
+# Characters of the leading numeric part of a value such as "1.5k"
+_NUMERIC_CHARS = '0123456789.'
 
-    def append(self, component_type, value):
-        if not self.head:
-            self.head = Node(component_type, value)
-        else:
-            current = self.head
-            while current.next:
-                current = current.next
-            current.next = Node(component_type, value)
+_UNIT_PREFIXES = {
+    'f': 1e-15,  # femto
+    'p': 1e-12,  # pico
+    'n': 1e-9,  # nano
+    'u': 1e-6,  # micro
+    'm': 1e-3,  # milli
+    'k': 1e3,  # kilo
+    'meg': 1e6,  # mega
+    'g': 1e9,  # giga
+}
 
 
 def parse_unit_prefix(value_str):
     """Convert SPICE unit prefixes to actual values."""
-    unit_prefixes = {
-        'f': 1e-15,  # femto
-        'p': 1e-12,  # pico
-        'n': 1e-9,  # nano
-        'u': 1e-6,  # micro
-        'm': 1e-3,  # milli
-        'k': 1e3,  # kilo
-        'meg': 1e6,  # mega
-        'g': 1e9,  # giga
-    }
-
     # Handle case where value is already a pure number
     try:
         return float(value_str)
     except ValueError:
         pass
 
-    # Extract the numeric part and unit part
-    numeric_part = ""
-    unit_part = ""
-
-    for char in value_str:
-        if char.isdigit() or char == '.':
-            numeric_part += char
-        else:
-            unit_part = value_str[len(numeric_part):].lower()
-            break
+    # Extract the numeric part (leading digits and dots) and unit part;
+    # lstrip scans in C and leaves exactly the unit suffix
+    unit_part = value_str.lstrip(_NUMERIC_CHARS)
+    numeric_part = value_str[:len(value_str) - len(unit_part)]
+    unit_part = unit_part.lower()
 
     try:
         value = float(numeric_part)
-        # Apply unit prefix if exists
-        for prefix, multiplier in unit_prefixes.items():
-            if unit_part == prefix:
-                value *= multiplier
-                break
-        return value
     except ValueError:
         return None
+    # Apply unit prefix if exists; anything else leaves the value unscaled
+    return value * _UNIT_PREFIXES.get(unit_part, 1.0)
 
 
 def parse_hspice_file(filename):
-    linked_list = LinkedList()
+    """
+    Parse the R/C elements of a SPICE file in file order.
+    Returns (types, values, rc_components): the component types ('R' or 'C'),
+    their values as a packed array of doubles, and the original lines.
+    """
+    types = []
+    values = array('d')  # 8 bytes per value instead of a float object each
     rc_components = []
 
     with open(filename, "r") as f:
-        lines = f.readlines()
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('*') or line.startswith('.'):
+        for line in f:  # stream the deck; no need to hold every line at once
+            # Only resistor/capacitor lines match; comments, dot-commands,
+            # blank lines and other elements are rejected without a split
+            rc_match = _RC_LINE.match(line)
+            if not rc_match:
                 continue
 
             parts = line.split()
             if len(parts) < 2:
                 continue
 
-            component_name = parts[0].upper()
+            component_type = rc_match.group(1).upper()
 
-            # Check if this is a resistor or capacitor
-            if component_name.startswith('R') or component_name.startswith('C'):
-                component_type = component_name[0]
+            # Find the value - typically the last part, but check for common formats
+            value_str = parts[-1]  # Assume value is the last parameter
 
-                # Find the value - typically the last part, but check for common formats
-                value_str = parts[-1]  # Assume value is the last parameter
+            # Handle cases where the value might be elsewhere
+            for part in parts[3:]:  # Values typically after node definitions
+                if any(char.isdigit() for char in part):
+                    value_str = part
+                    break
 
-                # Handle cases where the value might be elsewhere
-                for part in parts[3:]:  # Values typically after node definitions
-                    if any(char.isdigit() for char in part):
-                        value_str = part
-                        break
-
-                try:
-                    value = parse_unit_prefix(value_str)
-                    if value is not None:
-                        linked_list.append(component_type, value)
-                        rc_components.append(line)  # Store the original line
-                except (ValueError, IndexError):
-                    pass  # Skip if value cannot be parsed
+            try:
+                value = parse_unit_prefix(value_str)
+                if value is not None:
+                    types.append(component_type)
+                    values.append(value)
+                    rc_components.append(line.strip())  # Store the original line
+            except (ValueError, IndexError):
+                pass  # Skip if value cannot be parsed
 
-    return linked_list, rc_components
+    return types, values, rc_components
 
 
 def find_rc_section(lines):
@@ -138,25 +123,24 @@ def find_rc_section(lines):
     return start_idx, end_idx, rc_lines
 
 
-def apply_rules(linked_list):
+def apply_rules(types, values):
     # Initialize downstream values
     YD_1, YD_2, YD_3 = 0.0, 0.0, 0.0
 
     # Initialize upstream values
     YU_1, YU_2, YU_3 = YD_1, YD_2, YD_3
 
-    current = linked_list.head
-    while current:
-        if current.component_type == "C":  # Rule #1: Lumped Capacitor
-            C = current.value
+    # Single scan over the parallel type/value lists, in file order
+    for component_type, value in zip(types, values):
+        if component_type == "C":  # Rule #1: Lumped Capacitor
+            C = value
             YU_1 += C
             # YU_2 and YU_3 remain unchanged
-        elif current.component_type == "R":  # Rule #2: Lumped Resistor
-            R = current.value
-            YU_2 -= R * (YU_1 ** 2)
-            YU_3 -= 2 * R * YU_1 * YU_2 + R ** 2 * (YU_1 ** 3)
-
-        current = current.next
+        elif component_type == "R":  # Rule #2: Lumped Resistor
+            R = value
+            YU_1_2 = YU_1 * YU_1  # plain multiplies instead of float __pow__
+            YU_2 -= R * YU_1_2
+            YU_3 -= 2.0 * R * YU_1 * YU_2 + R * R * (YU_1_2 * YU_1)
 
     return YU_1, YU_2, YU_3
 
@@ -173,37 +157,28 @@ def get_rc_network_nodes(rc_lines):
     if not rc_lines:
         return "1", "2"  # Default if no RC components found
 
-    # Get the first component's first node (start node)
-    first_line = rc_lines[0].strip()
-    parts = first_line.split()
-    if len(parts) >= 3:
-        start_node = parts[1]
-    else:
-        start_node = "1"
-
-    # Find the last node in the sequence
-    nodes = set()
-    for line in rc_lines:
-        parts = line.strip().split()
+    # Split each line once: the first line gives the start node, and every
+    # line contributes its two nodes, counted in one Counter call (whose keys
+    # are also the node set, in first-seen order)
+    start_node = "1"
+    endpoints = []
+    for i, line in enumerate(rc_lines):
+        parts = line.split()
         if len(parts) >= 3:
-            nodes.add(parts[1])
-            nodes.add(parts[2])
+            if i == 0:
+                start_node = parts[1]
+            endpoints.append(parts[1])
+            endpoints.append(parts[2])
+    node_count = Counter(endpoints)
 
     # The end node is likely the one that appears only once (at the end of chain)
-    node_count = {}
-    for line in rc_lines:
-        parts = line.strip().split()
-        if len(parts) >= 3:
-            node_count[parts[1]] = node_count.get(parts[1], 0) + 1
-            node_count[parts[2]] = node_count.get(parts[2], 0) + 1
-
     end_nodes = [node for node, count in node_count.items() if count == 1 and node != start_node]
     if end_nodes:
         end_node = end_nodes[0]
     else:
         # If no clear end node, use the highest numbered node
         numeric_nodes = []
-        for node in nodes:
+        for node in node_count:
             try:
                 numeric_nodes.append((int(node), node))
             except ValueError:
@@ -231,20 +206,16 @@ def generate_pi_model_spice_file(input_file, output_file, R1, C1, C2):
     # Get the starting node of the RC network
     start_node, _ = get_rc_network_nodes(rc_lines)
 
-    # Create the new file
-    with open(output_file, "w") as f:
-        # Write everything before the RC network
-        for i in range(start_idx):
-            f.write(lines[i])
-
-        # Write Pi model components
-        f.write(f"R1 {start_node} 2 {R1:.6g}\n")
-        f.write(f"C1 {start_node} 0 {C1:.6g}\n")
-        f.write(f"C2 2 0 {C2:.6g}\n")
+    # Everything before the RC network, the Pi model components,
+    # then everything after the RC network, written in one call
+    out = lines[:start_idx]
+    out.append(f"R1 {start_node} 2 {R1:.6g}\n")
+    out.append(f"C1 {start_node} 0 {C1:.6g}\n")
+    out.append(f"C2 2 0 {C2:.6g}\n")
+    out.extend(lines[end_idx:])
 
-        # Write everything after the RC network
-        for i in range(end_idx, len(lines)):
-            f.write(lines[i])
+    with open(output_file, "w") as f:
+        f.write("".join(out))
 
 
 def save_pi_model_values(YU_1, YU_2, YU_3, R1, C1, C2):
@@ -260,15 +231,15 @@ def save_pi_model_values(YU_1, YU_2, YU_3, R1, C1, C2):
 
 
 def main(input_file, output_file):
-    # Parse the HSPICE file into a linked list
-    linked_list, rc_components = parse_hspice_file(input_file)
+    # Parse the HSPICE file into parallel type/value lists
+    types, values, rc_components = parse_hspice_file(input_file)
 
-    if not linked_list.head:
+    if not types:
         print("No valid RC components found in the file.")
         return
 
     # Apply rules to calculate upstream traversal values (YU)
-    YU_1, YU_2, YU_3 = apply_rules(linked_list)
+    YU_1, YU_2, YU_3 = apply_rules(types, values)
 
     # Convert to π model to find R1, C1, and C2
     R1, C1, C2 = convert_to_pi_model(YU_1, YU_2, YU_3)
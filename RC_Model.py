@@ -1,6 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from math import fsum
+from itertools import accumulate, chain
+from operator import mul
 
 # ---------- math helpers ----------
 def parse_list(csv_text: str):
@@ -8,12 +12,13 @@ def parse_list(csv_text: str):
     if not csv_text:
         return []
     try:
-        return [float(x.strip()) for x in csv_text.split(",") if x.strip()]
+        # float() tolerates surrounding whitespace; map/filter keep the loop in C
+        return list(map(float, filter(str.strip, csv_text.split(","))))
     except ValueError:
         raise ValueError("Enter comma-separated floats (e.g., 50,75,30).")
 
 def ceq_from(Cs):
-    return sum(Cs)
+    return fsum(Cs)  # exactly rounded, insensitive to cap ordering
 
 def sum_C_times_Rup(Rs, Cs, Rdrv):
     """
@@ -24,13 +29,9 @@ def sum_C_times_Rup(Rs, Cs, Rdrv):
     if not (len(Cs) == len(Rs) or len(Cs) == len(Rs) + 1):
         raise ValueError("Require len(Cs) = len(Rs) or len(Cs) = len(Rs)+1.")
 
-    total = 0.0
-    Rup = Rdrv
-    for i, Ci in enumerate(Cs):
-        total += Ci * Rup
-        if i < len(Rs):  # advance past Ri
-            Rup += Rs[i]
-    return total
+    # Rup at node i is Rdrv + R0 + ... + R(i-1); map stops at the last cap
+    Rup = accumulate(chain((Rdrv,), Rs))
+    return sum(map(mul, Cs, Rup), 0.0)
 
 def rc_equivalent(Rs, Cs, Rdrv):
     """
@@ -46,6 +47,10 @@ def rc_equivalent(Rs, Cs, Rdrv):
     return Req, Ceq, sumCR
 
 # ---------- SPICE writer ----------
+# ladder line templates; %-formatting beats f-strings in the per-element loops
+_CAP_LINE = "CG%d ng%d 0 %g"
+_RES_LINE = "RG%d ng%d ng%d %g"
+
 def write_spice_deck(path, Rs, Cs, Rdrv, VDD,
                      tr="1p", tf="1p", pw="50p", per="100p",
                      tstep="1p", tstop="2n"):
@@ -57,31 +62,32 @@ def write_spice_deck(path, Rs, Cs, Rdrv, VDD,
     """
     Req, Ceq, _ = rc_equivalent(Rs, Cs, Rdrv)
     N = len(Rs)
-    with open(path, "w") as f:
-        f.write("* RC equivalent vs GOLDEN ladder (GUI generated)\n")
-        f.write(f".param VDD={VDD}\n")
-        f.write(f"VSTEP in 0 PULSE(0 VDD 0 {tr} {tf} {pw} {per})\n")
-
-        f.write("\n* --- GOLDEN ---\n")
-        f.write(f"RDRV_G in ng0 {Rdrv:g}\n")
-        for i, Ci in enumerate(Cs):
-            f.write(f"CG{i} ng{i} 0 {Ci:g}\n")
-        for i, Ri in enumerate(Rs, start=1):
-            f.write(f"RG{i} ng{i-1} ng{i} {Ri:g}\n")
-
-        f.write("\n* --- RC equivalent ---\n")
-        f.write(f"RDRV_R in nr0 {Rdrv:g}\n")
-        f.write(f"RREQ  nr0 nr1 {Req:g}\n")
-        f.write(f"CREQ  nr1 0 {Ceq:g}\n")
-        f.write(f"* Computed: Req={Req:g} ohm, Ceq={Ceq:g} F\n")
-
-        f.write(f"\n.tran {tstep} {tstop}\n")
-        f.write(f".measure tran t50_golden TRIG v(in)  VAL='VDD/2' RISE=1  "
-                f"TARG v(ng{N}) VAL='VDD/2' RISE=1\n")
-        f.write(f".measure tran t50_rc     TRIG v(in)  VAL='VDD/2' RISE=1  "
-                f"TARG v(nr1)  VAL='VDD/2' RISE=1\n")
-        f.write(f".probe v(in) v(ng{N}) v(nr1)\n")
-        f.write(".end\n")
+    # collect every line and write the deck once
+    parts = []
+    append = parts.append
+    append("* RC equivalent vs GOLDEN ladder (GUI generated)")
+    append(f".param VDD={VDD}")
+    append(f"VSTEP in 0 PULSE(0 VDD 0 {tr} {tf} {pw} {per})")
+
+    append("\n* --- GOLDEN ---")
+    append(f"RDRV_G in ng0 {Rdrv:g}")
+    parts.extend(_CAP_LINE % (i, i, Ci) for i, Ci in enumerate(Cs))
+    parts.extend(_RES_LINE % (i, i - 1, i, Ri) for i, Ri in enumerate(Rs, start=1))
+
+    append("\n* --- RC equivalent ---")
+    append(f"RDRV_R in nr0 {Rdrv:g}")
+    append(f"RREQ  nr0 nr1 {Req:g}")
+    append(f"CREQ  nr1 0 {Ceq:g}")
+    append(f"* Computed: Req={Req:g} ohm, Ceq={Ceq:g} F")
+
+    append(f"\n.tran {tstep} {tstop}")
+    append(f".measure tran t50_golden TRIG v(in)  VAL='VDD/2' RISE=1  "
+           f"TARG v(ng{N}) VAL='VDD/2' RISE=1")
+    append(f".measure tran t50_rc     TRIG v(in)  VAL='VDD/2' RISE=1  "
+           f"TARG v(nr1)  VAL='VDD/2' RISE=1")
+    append(f".probe v(in) v(ng{N}) v(nr1)")
+    append(".end")
+    Path(path).write_text("\n".join(parts) + "\n")
 
 # ---------- GUI ----------
 class App(tk.Tk):
@@ -126,19 +132,30 @@ class App(tk.Tk):
         tk.Label(self, textvariable=self.res_var, font=("Segoe UI", 11, "bold")).grid(row=row, column=1, sticky="w", padx=10, pady=10)
         row += 1
 
-        tk.Button(self, text="Save SPICE deck…", command=self.save_spice).grid(row=row, column=0, sticky="w", padx=10, pady=6)
+        self.save_btn = tk.Button(self, text="Save SPICE deck…", command=self.save_spice)
+        self.save_btn.grid(row=row, column=0, sticky="w", padx=10, pady=6)
         row += 1
 
         self.current = None  # (Req, Ceq, Rs, Cs, Rdrv, VDD)
+        self._last_inputs = None  # entry texts behind self.current
+        self.pool = ThreadPoolExecutor(max_workers=1)  # deck writes, off the GUI thread
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def compute(self):
+        inputs = (self.rs_entry.get(), self.cs_entry.get(),
+                  self.rdrv_entry.get(), self.vdd_entry.get())
+        # unchanged inputs: self.current is still valid
+        if self.current is not None and inputs == self._last_inputs:
+            return
+        rs_text, cs_text, rdrv_text, vdd_text = inputs
         try:
-            Rs = parse_list(self.rs_entry.get())
-            Cs = parse_list(self.cs_entry.get())
-            Rdrv = float(self.rdrv_entry.get().strip())
-            VDD  = float(self.vdd_entry.get().strip())
+            Rs = parse_list(rs_text)
+            Cs = parse_list(cs_text)
+            Rdrv = float(rdrv_text.strip())
+            VDD  = float(vdd_text.strip())
             Req, Ceq, _ = rc_equivalent(Rs, Cs, Rdrv)
             self.current = (Req, Ceq, Rs, Cs, Rdrv, VDD)
+            self._last_inputs = inputs
             self.res_var.set(f"Req = {Req:g} Ω,   Ceq = {Ceq:g} F")
         except Exception as e:
             messagebox.showerror("Input error", str(e))
@@ -153,13 +170,30 @@ class App(tk.Tk):
                                             initialfile="rc_vs_golden.sp",
                                             filetypes=[("SPICE files","*.sp;*.cir;*.ckt"), ("All files","*.*")])
         if not path: return
+        # write on the worker thread so a long ladder doesn't freeze the window;
+        # the worker never touches Tk: entries are read here and completion
+        # is polled from the event loop
+        future = self.pool.submit(write_spice_deck, Path(path), Rs, Cs, Rdrv, VDD,
+                                  tstep=self.tstep_entry.get().strip() or "1p",
+                                  tstop=self.tstop_entry.get().strip() or "2n")
+        self.save_btn.config(state="disabled")  # one write at a time
+        self.after(50, self._poll_save, future, path)
+
+    def _poll_save(self, future, path):
+        if not future.done():
+            self.after(50, self._poll_save, future, path)
+            return
+        self.save_btn.config(state="normal")
         try:
-            write_spice_deck(Path(path), Rs, Cs, Rdrv, VDD,
-                             tstep=self.tstep_entry.get().strip() or "1p",
-                             tstop=self.tstop_entry.get().strip() or "2n")
+            future.result()
             messagebox.showinfo("Saved", f"SPICE deck written:\n{path}\n\nMeasures t50_golden vs t50_rc.")
         except Exception as e:
             messagebox.showerror("Save error", str(e))
 
+    def _on_close(self):
+        # a write already in flight still finishes before the interpreter exits
+        self.pool.shutdown(wait=False)
+        self.destroy()
+
 if __name__ == "__main__":
     App().mainloop()